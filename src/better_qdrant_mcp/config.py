@@ -8,6 +8,13 @@ class Settings:
     qdrant_api_key: str | None = os.getenv("QDRANT_API_KEY")
     default_collection: str | None = os.getenv("COLLECTION_NAME")
     qdrant_timeout: float = float(os.getenv("QDRANT_TIMEOUT", "30"))
+    # gRPC is used by default; QDRANT_FORCE_HTTP=1 falls back to REST
+    qdrant_grpc_port: int = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+    qdrant_force_http: bool = os.getenv("QDRANT_FORCE_HTTP", "0") == "1"
+    # Create new collections with int8 scalar quantization (originals kept on disk)
+    qdrant_scalar_quantization: bool = (
+        os.getenv("QDRANT_SCALAR_QUANTIZATION", "0") == "1"
+    )
     # OpenAI embeddings
     openai_api_key: str | None = os.getenv("OPENAPI_API_KEY") or os.getenv(
         "OPENAI_API_KEY"
@@ -17,6 +24,34 @@ class Settings:
         "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"
     )
     openai_timeout: float = float(os.getenv("OPENAI_TIMEOUT", "30"))
+    # Upper bound on concurrent embedding requests for large batches
+    openai_max_concurrency: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+    # Content-addressed embedding cache (empty path disables the disk layer)
+    embedding_cache_path: str = os.getenv(
+        "EMBEDDING_CACHE_PATH",
+        os.path.join(
+            os.path.expanduser("~"), ".cache", "better-qdrant-mcp", "embeddings.sqlite3"
+        ),
+    )
+    embedding_cache_size: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+    # Seconds before a cached embedding is recomputed; 0 keeps entries forever
+    embedding_cache_ttl: float = float(os.getenv("EMBEDDING_CACHE_TTL", "0"))
+    # Upper bound on vectors kept in the sqlite file (0 = unbounded)
+    embedding_cache_max_rows: int = int(
+        os.getenv("EMBEDDING_CACHE_MAX_ROWS", "20000")
+    )
+    # Search result cache: exact repeats plus near-duplicate queries
+    # (cosine >= SEARCH_CACHE_SIMILARITY). Opt-in: only writes made by this
+    # process invalidate it, so other processes' writes show up after the TTL
+    search_cache_ttl: float = float(os.getenv("SEARCH_CACHE_TTL", "0"))
+    search_cache_size: int = int(os.getenv("SEARCH_CACHE_SIZE", "2048"))
+    search_cache_similarity: float = float(
+        os.getenv("SEARCH_CACHE_SIMILARITY", "0.97")
+    )
+    # SYNC_UPSERT=0 buffers stores and writes them to Qdrant in small batches
+    sync_upsert: bool = os.getenv("SYNC_UPSERT", "1") != "0"
+    upsert_batch_window_ms: float = float(os.getenv("UPSERT_BATCH_WINDOW_MS", "50"))
+    upsert_batch_size: int = int(os.getenv("UPSERT_BATCH_SIZE", "128"))
     # Preferred vector name for multi-vector collections
     default_vector_name: str = os.getenv("DEFAULT_VECTOR_NAME", "dense")
 
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+
+def cache_key(model: str, text: str) -> bytes:
+    """Content address of an embedding: hash of model name and input text."""
+    return hashlib.blake2b(f"{model}\0{text}".encode("utf-8"), digest_size=32).digest()
+
+
+def _encode(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def _decode(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+class EmbeddingCache:
+    """Two-level embedding cache: an in-memory LRU backed by a sqlite file.
+
+    Vectors are kept as float32 arrays (and stored as their raw bytes) keyed by
+    ``cache_key(model, text)``.
+    A ``ttl`` of 0 keeps entries forever; an empty ``path`` disables the disk layer.
+    The file holds at most ``max_rows`` vectors (0 = unbounded): expired and oldest
+    rows are deleted when it is opened and every ``max_rows // 10`` writes after.
+    """
+
+    def __init__(
+        self,
+        path: str | None,
+        max_items: int = 1024,
+        ttl: float = 0,
+        max_rows: int = 0,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[bytes, Tuple[float, np.ndarray]] = OrderedDict()
+        self._max_items = max_items
+        self._ttl = ttl
+        self._max_rows = max_rows
+        self._prune_every = max(max_rows // 10, 100)
+        self._writes = 0
+        self._db: sqlite3.Connection | None = None
+        if path:
+            path = os.path.expanduser(path)
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                db = sqlite3.connect(path, check_same_thread=False)
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key BLOB PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+                )
+                db.execute(
+                    "CREATE INDEX IF NOT EXISTS embeddings_created_at "
+                    "ON embeddings (created_at)"
+                )
+                db.commit()
+                self._db = db
+                self._prune()
+            except (OSError, sqlite3.Error):
+                # e.g. read-only home directory: keep the in-memory layer only
+                self._db = None
+
+    def _prune(self) -> None:
+        # Drop expired rows, then the oldest ones beyond max_rows
+        assert self._db is not None
+        if self._ttl > 0:
+            self._db.execute(
+                "DELETE FROM embeddings WHERE created_at < ?",
+                (time.time() - self._ttl,),
+            )
+        if self._max_rows > 0:
+            self._db.execute(
+                "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings "
+                "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self._max_rows,),
+            )
+        self._db.commit()
+        self._writes = 0
+
+    def _fresh(self, created_at: float, now: float) -> bool:
+        return self._ttl <= 0 or now - created_at < self._ttl
+
+    def _remember(self, key: bytes, created_at: float, vector: np.ndarray) -> None:
+        self._memory[key] = (created_at, vector)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, np.ndarray]:
+        now = time.time()
+        found: Dict[bytes, np.ndarray] = {}
+        with self._lock:
+            misses: List[bytes] = []
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None and self._fresh(entry[0], now):
+                    self._memory.move_to_end(key)
+                    found[key] = entry[1]
+                else:
+                    misses.append(key)
+
+            if misses and self._db is not None:
+                rows = []
+                # Stay below SQLite's bound-parameter limit on large batches
+                for start in range(0, len(misses), 500):
+                    chunk = misses[start : start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows.extend(
+                        self._db.execute(
+                            "SELECT key, vector, created_at FROM embeddings "
+                            f"WHERE key IN ({placeholders})",
+                            chunk,
+                        ).fetchall()
+                    )
+                for key, blob, created_at in rows:
+                    if self._fresh(created_at, now):
+                        vector = _decode(blob)
+                        self._remember(key, created_at, vector)
+                        found[key] = vector
+        return found
+
+    def get(self, key: bytes) -> np.ndarray | None:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Iterable[Tuple[bytes, np.ndarray]]) -> None:
+        now = time.time()
+        items = list(items)
+        with self._lock:
+            for key, vector in items:
+                self._remember(key, now, vector)
+            if self._db is not None and items:
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                        [(key, _encode(vector), now) for key, vector in items],
+                    )
+                    self._db.commit()
+                    self._writes += len(items)
+                    if self._writes >= self._prune_every:
+                        self._prune()
+                except sqlite3.Error:
+                    # The disk layer is best-effort; never fail an embed because of it
+                    pass
+
+    def put(self, key: bytes, vector: np.ndarray) -> None:
+        self.put_many([(key, vector)])
@@ -1,52 +1,182 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import base64
 import re
 
+import httpx
 import jieba
+import numpy as np
 from fastembed import SparseTextEmbedding
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from .config import get_settings
+from .embedding_cache import EmbeddingCache, cache_key
+
+# Per-request limits for OpenAI embedding calls (roughly the 8k-token input cap)
+_BATCH_MAX_CHARS = 60_000
+_BATCH_MAX_ITEMS = 256
+# Keep warm HTTP/2 connections around so bursts of embed calls skip TLS setup
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=64)
+
+
+def _micro_batches(texts: List[str]) -> List[List[int]]:
+    """Pack text indices into request-sized batches, longest texts first."""
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+    batches: List[List[int]] = []
+    current: List[int] = []
+    chars = 0
+    for i in order:
+        size = len(texts[i])
+        if current and (
+            chars + size > _BATCH_MAX_CHARS or len(current) >= _BATCH_MAX_ITEMS
+        ):
+            batches.append(current)
+            current, chars = [], 0
+        current.append(i)
+        chars += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _as_vector(embedding: Any) -> np.ndarray:
+    """Decode one embedding from an OpenAI response into a float32 array.
+
+    Requests ask for base64 so the payload carries raw float32 bytes; servers
+    that ignore ``encoding_format`` send plain float lists instead.
+    """
+    if isinstance(embedding, str):
+        return np.frombuffer(base64.b64decode(embedding), dtype=np.float32)
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def _stack(vectors: List[np.ndarray]) -> np.ndarray:
+    if not vectors:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.stack(vectors)
 
 
 class Embeddings:
-    _client: OpenAI | None = None
+    """OpenAI dense embeddings as float32 arrays: (D,) per text, (N, D) per batch."""
+
+    _client: AsyncOpenAI | None = None
+    _cache: EmbeddingCache | None = None
 
     @classmethod
-    def client(cls) -> OpenAI:
+    def client(cls) -> AsyncOpenAI:
         if cls._client is None:
             s = get_settings()
             if not s.openai_api_key:
                 raise RuntimeError(
                     "OpenAI API key is required (OPENAPI_API_KEY or OPENAI_API_KEY)"
                 )
-            cls._client = OpenAI(
+            cls._client = AsyncOpenAI(
                 api_key=s.openai_api_key,
                 base_url=s.openai_base_url,
                 timeout=s.openai_timeout,
                 max_retries=2,
+                http_client=DefaultAsyncHttpxClient(
+                    http2=True, limits=_HTTP_LIMITS, timeout=s.openai_timeout
+                ),
             )
         return cls._client
 
     @classmethod
-    def embed_one(cls, text: str) -> List[float]:
+    def reset(cls) -> None:
+        """Drop the HTTP client and the cache so both are reopened on next use."""
+        cls._client = None
+        cls._cache = None
+
+    @classmethod
+    def cache(cls) -> EmbeddingCache:
+        if cls._cache is None:
+            s = get_settings()
+            cls._cache = EmbeddingCache(
+                s.embedding_cache_path,
+                max_items=s.embedding_cache_size,
+                ttl=s.embedding_cache_ttl,
+                max_rows=s.embedding_cache_max_rows,
+            )
+        return cls._cache
+
+    @classmethod
+    async def embed_one(cls, text: str) -> np.ndarray:
         s = get_settings()
-        resp = cls.client().embeddings.create(
+        key = cache_key(s.openai_embedding_model, text)
+        # The cache may hit sqlite; keep that blocking I/O off the event loop
+        cached = await asyncio.to_thread(cls.cache().get, key)
+        if cached is not None:
+            return cached
+
+        resp = await cls.client().embeddings.create(
             model=s.openai_embedding_model,
             input=text,
+            encoding_format="base64",
         )
-        return list(resp.data[0].embedding)
+        vector = _as_vector(resp.data[0].embedding)
+        await asyncio.to_thread(cls.cache().put, key, vector)
+        return vector
 
     @classmethod
-    def embed_many(cls, texts: Iterable[str]) -> List[List[float]]:
+    def _lookup(
+        cls, texts: List[str]
+    ) -> Tuple[List[bytes], Dict[bytes, np.ndarray], Dict[bytes, str]]:
+        """Split texts into cache hits and the unique misses still to embed."""
         s = get_settings()
-        # OpenAI API supports batching, but to keep behavior simple, call once with list
-        resp = cls.client().embeddings.create(
-            model=s.openai_embedding_model,
-            input=list(texts),
+        keys = [cache_key(s.openai_embedding_model, t) for t in texts]
+        found = cls.cache().get_many(keys)
+        pending: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in pending:
+                pending[key] = text
+        return keys, found, pending
+
+    @classmethod
+    def _merge(
+        cls,
+        keys: List[bytes],
+        found: Dict[bytes, np.ndarray],
+        pending: Dict[bytes, str],
+        batches: List[List[int]],
+        results: Iterable[List[np.ndarray]],
+    ) -> np.ndarray:
+        """Scatter per-batch results back to input order and cache them."""
+        pending_keys = list(pending.keys())
+        vectors: List[Optional[np.ndarray]] = [None] * len(pending_keys)
+        for batch, batch_vectors in zip(batches, results):
+            for idx, vector in zip(batch, batch_vectors):
+                vectors[idx] = vector
+        fresh = dict(zip(pending_keys, vectors))
+        cls.cache().put_many(fresh.items())  # type: ignore[arg-type]
+        found.update(fresh)  # type: ignore[arg-type]
+        return _stack([found[key] for key in keys])
+
+    @classmethod
+    async def embed_many(cls, texts: Iterable[str]) -> np.ndarray:
+        s = get_settings()
+        keys, found, pending = await asyncio.to_thread(cls._lookup, list(texts))
+        if not pending:
+            return _stack([found[key] for key in keys])
+
+        miss_texts = list(pending.values())
+        batches = _micro_batches(miss_texts)
+        semaphore = asyncio.Semaphore(max(1, s.openai_max_concurrency))
+
+        async def embed_batch(batch: List[int]) -> List[np.ndarray]:
+            async with semaphore:
+                resp = await cls.client().embeddings.create(
+                    model=s.openai_embedding_model,
+                    input=[miss_texts[i] for i in batch],
+                    encoding_format="base64",
+                )
+            return [_as_vector(item.embedding) for item in resp.data]
+
+        results = await asyncio.gather(*(embed_batch(b) for b in batches))
+        return await asyncio.to_thread(
+            cls._merge, keys, found, pending, batches, results
         )
-        return [list(item.embedding) for item in resp.data]
 
 
 _CJK_RE = re.compile(r"[\u4e00-\u9fff]")
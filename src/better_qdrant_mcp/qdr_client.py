@@ -1,154 +1,241 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
-from qdrant_client import QdrantClient
+import asyncio
+import logging
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models as qm
 from .config import get_settings
 
+logger = logging.getLogger(__name__)
+
+# Points per upsert request; bounds peak memory and request size on big ingests
+_UPSERT_CHUNK = 256
+# Seconds to wait before retrying a buffered batch whose write failed
+_RETRY_DELAY = 1.0
+
+
+class PartialUpsertError(RuntimeError):
+    """An upsert failed after its first chunks were already written.
+
+    ``written`` holds the IDs of the points that were stored, always a prefix
+    of the points passed in.
+    """
+
+    def __init__(self, written: List[Any], error: Exception) -> None:
+        super().__init__(f"{error} ({len(written)} point(s) were already written)")
+        self.written = written
+        self.__cause__ = error
+
+
+def _to_hits(points: Iterable[Any]) -> List[Dict[str, Any]]:
+    return [{"id": r.id, "score": r.score, "payload": r.payload} for r in points]
+
+
+def _collection_config(vector_size: int) -> Dict[str, Any]:
+    quantize = get_settings().qdrant_scalar_quantization
+    return {
+        # Create as a named vector collection with 'dense' vector
+        "vectors_config": {
+            "dense": qm.VectorParams(
+                size=vector_size,
+                distance=qm.Distance.COSINE,
+                # Full-precision vectors only needed for rescoring
+                on_disk=True if quantize else None,
+            )
+        },
+        "quantization_config": qm.ScalarQuantization(
+            scalar=qm.ScalarQuantizationConfig(
+                type=qm.ScalarType.INT8, always_ram=True
+            )
+        )
+        if quantize
+        else None,
+    }
+
+
+def _wire(vector: Any) -> Any:
+    # Vectors stay float32 arrays until here; the request models need plain lists
+    if isinstance(vector, np.ndarray):
+        return vector.tolist()
+    if isinstance(vector, dict):
+        return {name: _wire(v) for name, v in vector.items()}
+    return vector
+
+
+def _point_chunks(points: List[Dict[str, Any]]) -> Iterator[List[qm.PointStruct]]:
+    # points: [{id, vector, payload}]; PointStructs are built one chunk at a time
+    for start in range(0, len(points), _UPSERT_CHUNK):
+        yield [
+            qm.PointStruct(
+                id=p["id"],
+                vector=_wire(p.get("vector")),
+                payload=p.get("payload"),
+            )
+            for p in points[start : start + _UPSERT_CHUNK]
+        ]
+
+
+def _dense_requests(
+    queries: List[Tuple[np.ndarray, int, Optional[str]]],
+) -> List[qm.QueryRequest]:
+    return [
+        qm.QueryRequest(
+            query=_wire(vector), using=vector_name, limit=limit, with_payload=True
+        )
+        for vector, limit, vector_name in queries
+    ]
+
+
+def _hybrid_requests(
+    queries: List[Tuple[np.ndarray, List[int], List[float]]],
+    limit: int,
+    fusion: qm.Fusion,
+) -> List[qm.QueryRequest]:
+    return [
+        qm.QueryRequest(
+            prefetch=[
+                qm.Prefetch(query=_wire(dense_vector), using="dense"),
+                qm.Prefetch(
+                    query=qm.SparseVector(indices=indices, values=values),
+                    using="sparse",
+                ),
+            ],
+            query=qm.FusionQuery(fusion=fusion),
+            limit=limit,
+            with_payload=True,
+        )
+        for dense_vector, indices, values in queries
+    ]
+
+
+def _point_ids(ids: List[str]) -> List[int | str]:
+    # Numeric IDs name integer points; Qdrant rejects them as strings
+    return [int(i) if i.isascii() and i.isdigit() else i for i in ids]
+
+
+def _point_dicts(points: Iterable[Any], with_vectors: bool) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for p in points:
+        point_dict: Dict[str, Any] = {
+            "id": p.id,
+            "payload": p.payload or {},
+        }
+        if with_vectors and p.vector is not None:
+            point_dict["vector"] = p.vector
+        out.append(point_dict)
+    return out
+
+
+def _info_dict(info: Any) -> Dict[str, Any]:
+    # qdrant-client returns a typed object; convert to dict
+    return info.dict() if hasattr(info, "dict") else dict(info)  # type: ignore[arg-type]
+
 
 class QdrClient:
+    """Async access to Qdrant used by the MCP tools."""
+
     def __init__(self) -> None:
         s = get_settings()
         parsed = urlparse(s.qdrant_url)
+        # REST port (used when gRPC is disabled or unavailable for an operation)
         if parsed.port is not None:
             port = parsed.port
         elif parsed.scheme == "http":
             port = 80
         else:
             port = 443
-        self._client = QdrantClient(
-            prefer_grpc=False,
+        self._client = AsyncQdrantClient(
+            prefer_grpc=not s.qdrant_force_http,
             port=port,
+            grpc_port=s.qdrant_grpc_port,
             url=s.qdrant_url,
             api_key=s.qdrant_api_key,
             timeout=s.qdrant_timeout,
         )
 
-    def ensure_collection(self, name: str, vector_size: int) -> None:
+    async def ensure_collection(self, name: str, vector_size: int) -> bool:
+        """Create the collection if missing; returns True when it was created."""
         try:
-            self._client.create_collection(
-                collection_name=name,
-                # Create as a named vector collection with 'dense' vector
-                vectors_config={
-                    "dense": qm.VectorParams(
-                        size=vector_size, distance=qm.Distance.COSINE
-                    )
-                },
+            await self._client.create_collection(
+                collection_name=name, **_collection_config(vector_size)
             )
+            return True
         except Exception as e:  # collection may already exist
             # check exists; if exists, ignore, else re-raise
             try:
-                info = self._client.get_collection(name)
+                info = await self._client.get_collection(name)
                 if info is None:
                     raise
             except Exception:
                 raise e
+            return False
 
-    def upsert_points(
-        self,
-        name: str,
-        points: List[Dict[str, Any]],
-    ) -> None:
-        # points: [{id, vector, payload}]
-        self._client.upsert(
-            collection_name=name,
-            points=[
-                qm.PointStruct(
-                    id=p["id"],
-                    vector=p.get("vector"),
-                    payload=p.get("payload"),
-                )
-                for p in points
-            ],
-        )
+    async def upsert_points(self, name: str, points: List[Dict[str, Any]]) -> None:
+        """Upsert points in chunks of ``_UPSERT_CHUNK``.
 
-    def delete_points(self, name: str, ids: List[str]) -> None:
+        Each chunk is atomic, the whole call is not: if a later chunk fails,
+        ``PartialUpsertError`` reports the IDs already written.
+        """
+        written: List[Any] = []
+        for chunk in _point_chunks(points):
+            try:
+                await self._client.upsert(collection_name=name, points=chunk)
+            except Exception as e:
+                if written:
+                    raise PartialUpsertError(written, e) from e
+                raise
+            written.extend(p.id for p in chunk)
+
+    async def delete_points(self, name: str, ids: List[str]) -> None:
         # Delete one or more points by their IDs
         if not ids:
             return
-        self._client.delete(
+        await self._client.delete(
             collection_name=name,
-            points_selector=qm.PointIdsList(points=ids),
+            points_selector=qm.PointIdsList(points=_point_ids(ids)),
         )
 
-    def search(
+    async def search_batch(
         self,
         name: str,
-        vector: List[float],
-        limit: int = 5,
-        vector_name: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
-        results = self._client.search(
-            collection_name=name,
-            query_vector=vector
-            if vector_name is None
-            else qm.NamedVector(name=vector_name, vector=vector),
-            limit=limit,
-            with_payload=True,
+        queries: List[Tuple[np.ndarray, int, Optional[str]]],
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several dense searches in a single request.
+
+        Each query is a ``(vector, limit, vector_name)`` tuple; results are
+        returned in the same order as the queries.
+        """
+        if not queries:
+            return []
+        responses = await self._client.query_batch_points(
+            collection_name=name, requests=_dense_requests(queries)
         )
-        out: List[Dict[str, Any]] = []
-        for r in results:
-            out.append(
-                {
-                    "id": r.id,
-                    "score": r.score,
-                    "payload": r.payload,
-                }
-            )
-        return out
+        return [_to_hits(r.points) for r in responses]
 
-    def hybrid_search(
+    async def hybrid_search_batch(
         self,
         name: str,
-        dense_vector: List[float],
-        sparse_indices: Optional[List[int]] = None,
-        sparse_values: Optional[List[float]] = None,
+        queries: List[Tuple[np.ndarray, List[int], List[float]]],
         limit: int = 5,
         fusion: qm.Fusion = qm.Fusion.RRF,
-    ) -> List[Dict[str, Any]]:
-        """Hybrid dense+sparse search using Qdrant query_points API.
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several dense+sparse fused searches in a single request.
 
-        Falls back to dense-only search if sparse vectors are not provided.
+        Each query is a ``(dense_vector, sparse_indices, sparse_values)`` tuple.
         """
-
-        if sparse_indices is None or sparse_values is None:
-            return self.search(
-                name=name, vector=dense_vector, limit=limit, vector_name="dense"
-            )
-
-        # Prefetch.query expects either a dense vector list or a sparse vector dict
-        prefetch: List[qm.Prefetch] = [
-            qm.Prefetch(query=dense_vector, using="dense"),
-            qm.Prefetch(
-                query={"indices": sparse_indices, "values": sparse_values},
-                using="sparse",
-            ),
-        ]
-
-        res = self._client.query_points(
-            collection_name=name,
-            prefetch=prefetch,
-            query=qm.FusionQuery(fusion=fusion),
-            limit=limit,
-            with_payload=True,
+        if not queries:
+            return []
+        responses = await self._client.query_batch_points(
+            collection_name=name, requests=_hybrid_requests(queries, limit, fusion)
         )
+        return [_to_hits(r.points) for r in responses]
 
-        out: List[Dict[str, Any]] = []
-        # query_points returns a struct with .points list
-        points = getattr(res, "points", res)
-        for r in points:
-            out.append(
-                {
-                    "id": r.id,
-                    "score": r.score,
-                    "payload": r.payload,
-                }
-            )
-        return out
-
-    def scroll_samples(self, name: str, limit: int = 5) -> List[Dict[str, Any]]:
-        points, _ = self._client.scroll(
+    async def scroll_samples(self, name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        points, _ = await self._client.scroll(
             collection_name=name,
             with_payload=True,
             with_vectors=False,
@@ -156,7 +243,7 @@ class QdrClient:
         )
         return [{"id": p.id, "payload": p.payload} for p in points]
 
-    def retrieve_points(
+    async def retrieve_points(
         self, name: str, ids: List[str], with_vectors: bool = True
     ) -> List[Dict[str, Any]]:
         """Retrieve specific points by their IDs with full details.
@@ -172,25 +259,160 @@ class QdrClient:
         if not ids:
             return []
 
-        points = self._client.retrieve(
+        points = await self._client.retrieve(
             collection_name=name,
-            ids=ids,
+            ids=_point_ids(ids),
             with_payload=True,
             with_vectors=with_vectors,
         )
+        return _point_dicts(points, with_vectors)
+
+    async def collection_info(self, name: str) -> Dict[str, Any]:
+        return _info_dict(await self._client.get_collection(name))
+
+
+class UpsertBuffer:
+    """Coalesces upserts that arrive within a short window into batched requests.
+
+    Points are written by a background asyncio task once ``window`` seconds have
+    passed since the first pending point, or as soon as ``max_points`` are
+    pending. A batch whose write fails is put back and retried; after
+    ``max_retries`` failed attempts it is dropped and the error is raised by the
+    next ``check``/``flush`` of that collection. ``on_error`` is called with the
+    collection name whenever a write fails.
+    """
+
+    def __init__(
+        self,
+        client: QdrClient,
+        window: float = 0.05,
+        max_points: int = 128,
+        max_retries: int = 3,
+        on_error: Callable[[str], None] | None = None,
+    ) -> None:
+        self._client = client
+        self._window = window
+        self._max_points = max_points
+        self._max_retries = max_retries
+        self._on_error = on_error
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._count = 0
+        self._attempts: Dict[str, int] = {}
+        # Writes given up on in the background, raised on the next call for them
+        self._failures: Dict[str, Exception] = {}
+        self._wakeup = asyncio.Event()
+        # Serializes flushes so a caller's flush() also waits for in-flight writes
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    def add(self, name: str, points: List[Dict[str, Any]]) -> None:
+        self._pending.setdefault(name, []).extend(points)
+        self._count += len(points)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+
+    def check(self, name: str) -> None:
+        """Raise (once) the error of buffered points dropped for this collection."""
+        failure = self._failures.pop(name, None)
+        if failure is not None:
+            raise failure
+
+    async def flush(self, name: Optional[str] = None) -> int:
+        """Write pending points (of one collection, or all); returns the count.
+
+        Raises the write error if a batch could not be written; the batch stays
+        queued until it has failed ``max_retries`` times.
+        """
+        written, failure = await self._write(name, record=False)
+        for collection in [name] if name is not None else list(self._failures):
+            self.check(collection)
+        if failure is not None:
+            raise failure
+        return written
+
+    async def aclose(self) -> None:
+        """Stop the background task and write out whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        _, failure = await self._write(None, record=False)
+        if failure is not None:
+            logger.error("Failed to flush buffered upserts to Qdrant: %s", failure)
+
+    async def _write(
+        self, name: Optional[str], record: bool
+    ) -> Tuple[int, Exception | None]:
+        written = 0
+        failure: Exception | None = None
+        async with self._flush_lock:
+            for collection in [name] if name is not None else list(self._pending):
+                points = self._pending.pop(collection, None)
+                if not points:
+                    continue
+                self._count -= len(points)
+                try:
+                    await self._client.upsert_points(collection, points)
+                except Exception as e:
+                    if isinstance(e, PartialUpsertError):
+                        # Only the chunks that did not make it are retried
+                        written += len(e.written)
+                        points = points[len(e.written) :]
+                    error = self._requeue(collection, points, e)
+                    if error is not None and record:
+                        self._failures[collection] = error
+                    failure = failure or error or e
+                    continue
+                self._attempts.pop(collection, None)
+                written += len(points)
+        return written, failure
+
+    def _requeue(
+        self, name: str, points: List[Dict[str, Any]], error: Exception
+    ) -> Exception | None:
+        """Put a failed batch back; returns the error to report once it is dropped."""
+        if self._on_error is not None:
+            self._on_error(name)
+        attempts = self._attempts.get(name, 0) + 1
+        if attempts < self._max_retries:
+            self._attempts[name] = attempts
+            self._pending[name] = points + self._pending.get(name, [])
+            self._count += len(points)
+            return None
+        self._attempts.pop(name, None)
+        ids = ", ".join(str(p["id"]) for p in points)
+        dropped = RuntimeError(
+            f"{len(points)} buffered point(s) could not be written to collection "
+            f"'{name}' after {attempts} attempts: {error}. Lost IDs: {ids}"
+        )
+        dropped.__cause__ = error
+        return dropped
 
-        out: List[Dict[str, Any]] = []
-        for p in points:
-            point_dict: Dict[str, Any] = {
-                "id": p.id,
-                "payload": p.payload or {},
-            }
-            if with_vectors and p.vector is not None:
-                point_dict["vector"] = p.vector
-            out.append(point_dict)
-        return out
-
-    def collection_info(self, name: str) -> Dict[str, Any]:
-        info = self._client.get_collection(name)
-        # qdrant-client returns a typed object; convert to dict
-        return info.dict() if hasattr(info, "dict") else dict(info)  # type: ignore[arg-type]
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._count:
+                continue
+            deadline = loop.time() + self._window
+            while self._count < self._max_points:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                self._wakeup.clear()
+            _, failure = await self._write(None, record=True)
+            if failure is not None:
+                logger.error("Failed to flush buffered upserts to Qdrant: %s", failure)
+                # Re-queued batches are retried after a pause
+                await asyncio.sleep(_RETRY_DELAY)
+                if self._count:
+                    self._wakeup.set()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Sequence, Tuple
+import time
+
+import numpy as np
+
+Hits = List[Dict[str, Any]]
+
+# Recent query embeddings kept per collection for the similarity lookup
+_RECENT_PER_COLLECTION = 256
+
+
+class SearchCache:
+    """Two-tier cache of search results, invalidated by writes to a collection.
+
+    Exact hits are keyed by ``(collection, query, limit)``. On an exact miss, a
+    query whose embedding has cosine similarity >= ``similarity`` with a recent
+    query on the same collection reuses that query's results. Every cached
+    result records the collection's write version; ``invalidate`` bumps it.
+    A ``ttl`` of 0 disables the cache.
+    """
+
+    def __init__(
+        self, max_items: int = 2048, ttl: float = 0, similarity: float = 0.97
+    ) -> None:
+        self._max_items = max_items
+        self._ttl = ttl
+        self._similarity = similarity
+        self._exact: OrderedDict[Tuple[str, str, int], Tuple[float, int, Hits]] = (
+            OrderedDict()
+        )
+        # collection -> (expires_at, version, limit, unit-norm float32 vector, hits)
+        self._recent: Dict[str, Deque[Tuple[float, int, int, np.ndarray, Hits]]] = {}
+        self._versions: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    def version(self, collection: str) -> int:
+        return self._versions.get(collection, 0)
+
+    def invalidate(self, collection: str) -> None:
+        self._versions[collection] = self.version(collection) + 1
+        self._recent.pop(collection, None)
+
+    def get(self, collection: str, query: str, limit: int) -> Hits | None:
+        if not self.enabled:
+            return None
+        key = (collection, query, limit)
+        entry = self._exact.get(key)
+        if entry is None:
+            return None
+        expires_at, version, hits = entry
+        if expires_at <= time.monotonic() or version != self.version(collection):
+            del self._exact[key]
+            return None
+        self._exact.move_to_end(key)
+        return hits
+
+    def get_similar(
+        self, collection: str, vector: Sequence[float], limit: int
+    ) -> Hits | None:
+        if not self.enabled or self._similarity > 1:
+            return None
+        now = time.monotonic()
+        version = self.version(collection)
+        candidates = [
+            e
+            for e in self._recent.get(collection, ())
+            if e[0] > now and e[1] == version and e[2] >= limit
+        ]
+        if not candidates:
+            return None
+        query = _unit(vector)
+        scores = np.stack([e[3] for e in candidates]) @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self._similarity:
+            return None
+        return candidates[best][4][:limit]
+
+    def put(
+        self,
+        collection: str,
+        query: str,
+        limit: int,
+        vector: Sequence[float],
+        hits: Hits,
+        version: int,
+    ) -> None:
+        """Cache results computed while the collection was at ``version``."""
+        if not self.enabled or version != self.version(collection):
+            return
+        expires_at = time.monotonic() + self._ttl
+        key = (collection, query, limit)
+        self._exact[key] = (expires_at, version, hits)
+        self._exact.move_to_end(key)
+        while len(self._exact) > self._max_items:
+            self._exact.popitem(last=False)
+        recent = self._recent.setdefault(
+            collection, deque(maxlen=_RECENT_PER_COLLECTION)
+        )
+        recent.append((expires_at, version, limit, _unit(vector), hits))
+
+
+def _unit(vector: Sequence[float]) -> np.ndarray:
+    arr = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    return arr / norm if norm else arr
@@ -1,29 +1,244 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Annotated
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Annotated, Optional, Tuple
+import contextlib
+import functools
 import os
 import argparse
+import asyncio
+import time
+import uuid
+import numpy as np
 from fastmcp import FastMCP
 from pydantic import BaseModel, Field, BeforeValidator
 import json
 
+try:  # optional speedup, installed with the "fast" extra
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
 from .config import get_settings
 from .embeddings import Embeddings, SparseEmbeddings
-from .qdr_client import QdrClient
+from .qdr_client import PartialUpsertError, QdrClient, UpsertBuffer
+from .search_cache import SearchCache
 from .version import __version__
 
 
-mcp = FastMCP("better-qdrant-mcp", version=__version__)
-_qdr = QdrClient()
+@contextlib.asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    try:
+        yield
+    finally:
+        # Write out buffered stores while the event loop (and client) still exist
+        if _upsert_buffer.cache_info().currsize:
+            buffer = _upsert_buffer()
+            if buffer is not None:
+                await buffer.aclose()
+
+
+mcp = FastMCP("better-qdrant-mcp", version=__version__, lifespan=_lifespan)
 _settings = get_settings()
+_search_cache = SearchCache(
+    max_items=_settings.search_cache_size,
+    ttl=_settings.search_cache_ttl,
+    similarity=_settings.search_cache_similarity,
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _qdr() -> QdrClient:
+    # Created on first use so importing this module never opens connections
+    return QdrClient()
+
+
+@functools.lru_cache(maxsize=1)
+def _upsert_buffer() -> UpsertBuffer | None:
+    if _settings.sync_upsert:
+        return None
+    return UpsertBuffer(
+        _qdr(),
+        window=_settings.upsert_batch_window_ms / 1000,
+        max_points=_settings.upsert_batch_size,
+        on_error=_forget_collection,
+    )
+
+
+def _reset_after_fork() -> None:
+    # A forked child must open its own connections rather than reuse the
+    # parent's: Qdrant, the pooled OpenAI HTTP/2 client and the sqlite cache
+    _qdr.cache_clear()
+    _upsert_buffer.cache_clear()
+    Embeddings.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
 
+def _utcnow_iso() -> str:
+    # Naive UTC ISO timestamp with a trailing "Z", as stored in `stored_at`
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
 
-def _ensure_list(v: Any) -> List[str]:
-    if isinstance(v, str):
-        return [v]
+
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize tool output as JSON text, using orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+
+_uuid7 = getattr(uuid, "uuid7", None)  # stdlib on Python 3.14+
+
+
+def _new_point_id() -> str:
+    """Return a time-ordered UUIDv7 so points written together stay close in Qdrant."""
+    if _uuid7 is not None:
+        return str(_uuid7())
+    # RFC 9562 layout: 48-bit unix ms timestamp, version 7, variant, 74 random bits
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | (rand >> 68) << 64
+        | 0b10 << 62
+        | rand & ((1 << 62) - 1)
+    )
+    return str(uuid.UUID(int=value))
+
+
+def _id_str(v: Any) -> Any:
+    # Qdrant also uses unsigned integer point IDs; keep the tools' IDs as strings
+    if isinstance(v, int) and not isinstance(v, bool):
+        return str(v)
+    return v
+
+
+def _ensure_list(v: Any) -> Any:
+    # Accept a single ID, a list/tuple/set of IDs, or nothing. Anything else is
+    # returned unchanged so pydantic reports it as a validation error.
+    if v is None:
+        return []
+    if isinstance(v, (str, int)) and not isinstance(v, bool):
+        return [_id_str(v)]
+    if isinstance(v, (list, tuple, set, frozenset)):
+        return [_id_str(i) for i in v]
     return v
 
 
+# Collection vector layout rarely changes, so avoid a Qdrant round-trip per call.
+_SCHEMA_TTL = 60.0
+_schema_cache: dict[str, tuple[float, Dict[str, bool]]] = {}
+
+
+async def _get_schema(collection: str) -> Dict[str, bool]:
+    """Return which named vectors the collection has, cached for a short TTL."""
+    now = time.monotonic()
+    cached = _schema_cache.get(collection)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    info = await _qdr().collection_info(collection)
+    params = info.get("config", {}).get("params", {})
+    vectors_cfg = params.get("vectors")
+    sparse_cfg = params.get("sparse_vectors")
+    schema = {
+        "has_named_dense": isinstance(vectors_cfg, dict) and "dense" in vectors_cfg,
+        "has_sparse": isinstance(sparse_cfg, dict) and "sparse" in sparse_cfg,
+    }
+    _schema_cache[collection] = (now + _SCHEMA_TTL, schema)
+    return schema
+
+
+async def _try_get_schema(collection: str) -> Dict[str, bool] | None:
+    # The collection may not exist yet; callers ensure it and ask again
+    try:
+        return await _get_schema(collection)
+    except Exception:
+        return None
+
+
+SparseVector = Tuple[List[int], List[float]]
+
+
+@functools.cache
+def _vector_builder(
+    has_named_dense: bool, has_sparse: bool
+) -> Callable[[np.ndarray, Optional[SparseVector]], Any]:
+    """Return a function building a point's `vector` field for a collection layout.
+
+    There are only a handful of layouts, so the branching is resolved once per
+    layout rather than for every stored point.
+    """
+    if not has_named_dense:
+        # Legacy single vector
+        return lambda dense, sparse: dense
+    if not has_sparse:
+        return lambda dense, sparse: {"dense": dense}
+
+    def dense_and_sparse(
+        dense: np.ndarray, sparse: Optional[SparseVector]
+    ) -> Dict[str, Any]:
+        # Named vectors: "dense" + "sparse" when the text produced any terms
+        if sparse and sparse[0] and sparse[1]:
+            return {
+                "dense": dense,
+                "sparse": {"indices": sparse[0], "values": sparse[1]},
+            }
+        return {"dense": dense}
+
+    return dense_and_sparse
+
+
+# Collections already known to exist in this process
+_ensured: set[str] = set()
+
+
+async def _ensure_collection(collection: str, vector_size: int) -> None:
+    if collection in _ensured:
+        return
+    if await _qdr().ensure_collection(collection, vector_size):
+        # Freshly created with a dense-only layout; no need to ask Qdrant for it
+        _schema_cache[collection] = (
+            time.monotonic() + _SCHEMA_TTL,
+            {"has_named_dense": True, "has_sparse": False},
+        )
+    _ensured.add(collection)
+
+
+def _forget_collection(collection: str) -> None:
+    # The collection may have been dropped or recreated; re-check next time
+    _ensured.discard(collection)
+    _schema_cache.pop(collection, None)
+
+
+async def _upsert(collection: str, points: List[Dict[str, Any]]) -> None:
+    buffer = _upsert_buffer()
+    if buffer is not None:
+        # Report earlier buffered points for this collection that were lost
+        buffer.check(collection)
+        buffer.add(collection, points)
+        _search_cache.invalidate(collection)
+        return
+    try:
+        await _qdr().upsert_points(collection, points)
+    except Exception:
+        _forget_collection(collection)
+        raise
+    finally:
+        _search_cache.invalidate(collection)
+
+
+async def _flush_pending(collection: str) -> None:
+    # Make buffered writes visible before reading from or deleting in a collection
+    buffer = _upsert_buffer()
+    if buffer is not None:
+        await buffer.flush(collection)
+
+
 @mcp.tool(
     name="store-knowledge",
     description=(
@@ -32,7 +247,7 @@ def _ensure_list(v: Any) -> List[str]:
         "Automatically embeds the text and returns the stored ID."
     ),
 )
-def store_knowledge(
+async def store_knowledge(
     content: str = Field(
         ..., description="The content to store in the knowledge base."
     ),
@@ -60,15 +275,18 @@ def store_knowledge(
 
     # Combine title and content for embedding to improve semantic search
     text_to_embed = f"{title}\n{content}" if title else content
-    vector = Embeddings.embed_one(text_to_embed)
+    # Embed while the collection layout is being fetched
+    vector, schema = await asyncio.gather(
+        Embeddings.embed_one(text_to_embed), _try_get_schema(collection)
+    )
 
     # Ensure collection exists with the right dimensionality for dense vectors
-    _qdr.ensure_collection(collection, len(vector))
+    await _ensure_collection(collection, len(vector))
 
-    point_id = str(__import__("uuid").uuid4())
+    point_id = _new_point_id()
     payload: Dict[str, Any] = {
         "content": content,
-        "stored_at": __import__("datetime").datetime.utcnow().isoformat() + "Z",
+        "stored_at": _utcnow_iso(),
     }
     if title:
         payload["title"] = title
@@ -77,32 +295,22 @@ def store_knowledge(
     if metadata:
         payload["metadata"] = metadata
 
-    info = _qdr.collection_info(collection)
-    vectors_cfg = info.get("config", {}).get("params", {}).get("vectors")
-    has_named_dense = isinstance(vectors_cfg, dict) and "dense" in vectors_cfg
+    if schema is None:
+        schema = await _get_schema(collection)
+    has_named_dense = schema["has_named_dense"]
+    has_sparse = schema["has_sparse"]
 
-    # Try to detect sparse configuration
-    sparse_cfg = info.get("config", {}).get("params", {}).get("sparse_vectors")
-    has_sparse = isinstance(sparse_cfg, dict) and "sparse" in sparse_cfg
+    sparse = None
+    if has_named_dense and has_sparse:
+        sparse = await asyncio.to_thread(SparseEmbeddings.embed_one, text_to_embed)
 
     point: Dict[str, Any] = {
         "id": point_id,
         "payload": payload,
+        "vector": _vector_builder(has_named_dense, has_sparse)(vector, sparse),
     }
 
-    if has_named_dense:
-        # Named vectors: "dense" + optionally "sparse"
-        vectors_dict = {"dense": vector}
-        if has_sparse:
-            indices, values = SparseEmbeddings.embed_one(text_to_embed)
-            if indices and values:
-                vectors_dict["sparse"] = {"indices": indices, "values": values}
-        point["vector"] = vectors_dict
-    else:
-        # Legacy single vector
-        point["vector"] = vector
-
-    _qdr.upsert_points(collection, [point])
+    await _upsert(collection, [point])
 
     return f"Information stored successfully in collection '{collection}' with ID: {point_id}"
 
@@ -128,7 +336,7 @@ class KnowledgeItem(BaseModel):
         "Each item is automatically embedded and stored with a unique ID."
     ),
 )
-def store_knowledge_bulk(
+async def store_knowledge_bulk(
     items: List[KnowledgeItem] = Field(
         ..., description="List of knowledge items to store in the knowledge base."
     ),
@@ -154,33 +362,35 @@ def store_knowledge_bulk(
         text = f"{item.title}\n{item.content}" if item.title else item.content
         texts_to_embed.append(text)
 
-    # Batch embed all texts at once
-    vectors = Embeddings.embed_many(texts_to_embed)
+    # Batch embed all texts while the collection layout is being fetched
+    vectors, schema = await asyncio.gather(
+        Embeddings.embed_many(texts_to_embed), _try_get_schema(collection)
+    )
 
     # Ensure collection exists with the right dimensionality for dense vectors
-    _qdr.ensure_collection(collection, len(vectors[0]))
-
-    # Get collection info to determine vector configuration
-    info = _qdr.collection_info(collection)
-    vectors_cfg = info.get("config", {}).get("params", {}).get("vectors")
-    has_named_dense = isinstance(vectors_cfg, dict) and "dense" in vectors_cfg
+    await _ensure_collection(collection, vectors.shape[1])
 
-    # Try to detect sparse configuration
-    sparse_cfg = info.get("config", {}).get("params", {}).get("sparse_vectors")
-    has_sparse = isinstance(sparse_cfg, dict) and "sparse" in sparse_cfg
+    # Determine vector configuration of the collection (cached)
+    if schema is None:
+        schema = await _get_schema(collection)
+    has_named_dense = schema["has_named_dense"]
+    has_sparse = schema["has_sparse"]
 
     # Generate sparse embeddings if needed
     sparse_embeddings = None
     if has_named_dense and has_sparse:
-        sparse_embeddings = SparseEmbeddings.embed_many(texts_to_embed)
+        sparse_embeddings = await asyncio.to_thread(
+            SparseEmbeddings.embed_many, texts_to_embed
+        )
 
     # Build all points
     points = []
     point_ids = []
-    current_time = __import__("datetime").datetime.utcnow().isoformat() + "Z"
+    current_time = _utcnow_iso()
+    build_vector = _vector_builder(has_named_dense, has_sparse)
 
     for idx, item in enumerate(items):
-        point_id = str(__import__("uuid").uuid4())
+        point_id = _new_point_id()
         point_ids.append(point_id)
 
         payload: Dict[str, Any] = {
@@ -197,24 +407,25 @@ def store_knowledge_bulk(
         point: Dict[str, Any] = {
             "id": point_id,
             "payload": payload,
+            "vector": build_vector(
+                vectors[idx], sparse_embeddings[idx] if sparse_embeddings else None
+            ),
         }
 
-        if has_named_dense:
-            # Named vectors: "dense" + optionally "sparse"
-            vectors_dict = {"dense": vectors[idx]}
-            if has_sparse and sparse_embeddings:
-                indices, values = sparse_embeddings[idx]
-                if indices and values:
-                    vectors_dict["sparse"] = {"indices": indices, "values": values}
-            point["vector"] = vectors_dict
-        else:
-            # Legacy single vector
-            point["vector"] = vectors[idx]
-
         points.append(point)
 
     # Batch upsert all points at once
-    _qdr.upsert_points(collection, points)
+    try:
+        await _upsert(collection, points)
+    except PartialUpsertError as e:
+        # Large batches are written in chunks; tell the caller what did land
+        stored = len(e.written)
+        raise RuntimeError(
+            f"Stored only the first {stored} of {len(items)} item(s) in collection "
+            f"'{collection}' before failing: {e.__cause__}. "
+            f"Stored IDs: {', '.join(map(str, e.written))}. "
+            f"Retry only the remaining {len(items) - stored} item(s)."
+        ) from e
 
     # Return detailed result
     result_msg = (
@@ -225,19 +436,63 @@ def store_knowledge_bulk(
     return result_msg
 
 
+async def _search_batch(
+    collection: str,
+    schema: Dict[str, bool],
+    queries: List[str],
+    query_vecs: np.ndarray,
+    limit: int,
+) -> List[List[Dict[str, Any]]]:
+    has_named_dense = schema["has_named_dense"]
+    has_sparse = schema["has_sparse"]
+
+    # All queries go to Qdrant in a single batch request
+    if has_named_dense and has_sparse:
+        # Hybrid search: dense + sparse (BM25)
+        sparse = await asyncio.to_thread(SparseEmbeddings.embed_many, queries)
+        return await _qdr().hybrid_search_batch(
+            collection,
+            [
+                (vec, indices, values)
+                for vec, (indices, values) in zip(query_vecs, sparse)
+            ],
+            limit=limit,
+        )
+
+    # Fallback: dense-only search (backward compatible)
+    vector_name = "dense" if has_named_dense else None
+    return await _qdr().search_batch(
+        collection, [(vec, limit, vector_name) for vec in query_vecs]
+    )
+
+
+def _format_hits(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "score": r.get("score", 0.0),
+            "id": r.get("id"),
+            "point_id": r.get("id"),
+            "payload": r.get("payload", {}),
+        }
+        for r in results
+    ]
+
+
 @mcp.tool(
     name="search-knowledge",
     description=(
         "Search for relevant information in the long-term knowledge base using semantic search. "
-        "Use this to retrieve context, facts, or past interactions stored in Qdrant."
+        "Use this to retrieve context, facts, or past interactions stored in Qdrant. "
+        "Pass a list of queries to run several searches in one round-trip."
     ),
 )
-def search_knowledge(
-    query: str = Field(
-        ..., description="The search query to find relevant information."
+async def search_knowledge(
+    query: str | List[str] = Field(
+        ...,
+        description="The search query to find relevant information, or a list of queries.",
     ),
     limit: int = Field(
-        5, description="Maximum number of results to return (default: 5)."
+        5, description="Maximum number of results to return per query (default: 5)."
     ),
     collection_name: str = Field(
         "",
@@ -248,61 +503,65 @@ def search_knowledge(
 
     Returns:
         JSON string containing a list of search results, each with 'score', 'point_id', and 'payload'.
+        For a list of queries, a JSON list of {'query', 'results'} objects in query order.
     """
     collection = collection_name or _settings.default_collection
     if not collection:
         raise ValueError("Collection name is required")
 
-    query_vec = Embeddings.embed_one(query)
-
-    # Inspect collection config to decide whether hybrid search is available
-    try:
-        _info = _qdr.collection_info(collection)
-    except Exception:
-        _info = {}
-
-    _vectors = (_info or {}).get("config", {}).get("params", {}).get("vectors")
-    vectors_is_named = isinstance(_vectors, dict)
-    has_named_dense = vectors_is_named and "dense" in _vectors
-
-    sparse_cfg = (_info or {}).get("config", {}).get("params", {}).get("sparse_vectors")
-    has_sparse = isinstance(sparse_cfg, dict) and "sparse" in sparse_cfg
-
-    if has_named_dense and has_sparse:
-        # Hybrid search: dense + sparse (BM25)
-        indices, values = SparseEmbeddings.embed_one(query)
-        results = _qdr.hybrid_search(
-            collection,
-            dense_vector=query_vec,
-            sparse_indices=indices,
-            sparse_values=values,
-            limit=limit,
-        )
-    else:
-        # Fallback: dense-only search (backward compatible)
-        results = _qdr.search(
-            collection,
-            query_vec,
-            limit,
-            vector_name=("dense" if has_named_dense else None),
-        )
-
-    if not results:
-        return f'No relevant information found for query: "{query}"'
-
-    # Return only structured data as serialized text (JSON string)
-    structured_results: list[Dict[str, Any]] = []
-    for r in results:
-        structured_results.append(
-            {
-                "score": r.get("score", 0.0),
-                "id": r.get("id"),
-                "point_id": r.get("id"),
-                "payload": r.get("payload", {}),
-            }
+    queries = [query] if isinstance(query, str) else list(query)
+    if not queries:
+        raise ValueError("At least one query is required")
+
+    await _flush_pending(collection)
+    version = _search_cache.version(collection)
+
+    # Exact repeats are answered without embedding or searching
+    batches: List[Any] = [_search_cache.get(collection, q, limit) for q in queries]
+    pending = [i for i, hits in enumerate(batches) if hits is None]
+    if pending:
+        pending_queries = [queries[i] for i in pending]
+        # Embed the queries while inspecting the collection config to decide
+        # whether hybrid search is available
+        query_vecs, schema = await asyncio.gather(
+            Embeddings.embed_many(pending_queries), _try_get_schema(collection)
         )
-
-    return json.dumps(structured_results, ensure_ascii=False)
+        if schema is None:
+            schema = {"has_named_dense": False, "has_sparse": False}
+
+        # Near-duplicates of recent queries reuse their results
+        to_search = []
+        for i, q, vec in zip(pending, pending_queries, query_vecs):
+            hits = _search_cache.get_similar(collection, vec, limit)
+            if hits is None:
+                to_search.append((i, q, vec))
+            else:
+                batches[i] = hits
+
+        if to_search:
+            found = await _search_batch(
+                collection,
+                schema,
+                [q for _, q, _ in to_search],
+                [vec for _, _, vec in to_search],
+                limit,
+            )
+            for (i, q, vec), hits in zip(to_search, found):
+                batches[i] = hits
+                _search_cache.put(collection, q, limit, vec, hits, version)
+
+    if isinstance(query, str):
+        if not batches[0]:
+            return f'No relevant information found for query: "{query}"'
+        # Return only structured data as serialized text (JSON string)
+        return _dumps(_format_hits(batches[0]))
+
+    return _dumps(
+        [
+            {"query": q, "results": _format_hits(results)}
+            for q, results in zip(queries, batches)
+        ]
+    )
 
 
 @mcp.tool(
@@ -312,7 +571,7 @@ def search_knowledge(
         "Useful for debugging collection settings or verifying stored content."
     ),
 )
-def inspect_knowledge_base(
+async def inspect_knowledge_base(
     collection_name: str = Field(
         "",
         description="Optional collection to inspect; defaults to env COLLECTION_NAME.",
@@ -327,12 +586,16 @@ def inspect_knowledge_base(
     if not collection:
         raise ValueError("Collection name is required")
 
-    info = _qdr.collection_info(collection)
-    samples = _qdr.scroll_samples(collection, limit=5)
+    await _flush_pending(collection)
+    # Independent requests; fetch them concurrently
+    info, samples = await asyncio.gather(
+        _qdr().collection_info(collection),
+        _qdr().scroll_samples(collection, limit=5),
+    )
 
     out = [
         f'Collection Info for "{collection}":',
-        __import__("json").dumps(info, indent=2),
+        _dumps(info, indent=True),
     ]
     out.append("")
     out.append(f"Sample Data (first {len(samples)} points):")
@@ -340,7 +603,7 @@ def inspect_knowledge_base(
         out.append(f"\n--- Point {idx} (ID: {p.get('id')}) ---")
         payload = p.get("payload", {})
         out.append(f"Payload keys: {', '.join(payload.keys())}")
-        out.append("Payload: " + __import__("json").dumps(payload, indent=2))
+        out.append("Payload: " + _dumps(payload, indent=True))
 
     return "\n".join(out)
 
@@ -353,7 +616,7 @@ def inspect_knowledge_base(
         "Use the 'id' field returned from search-knowledge results."
     ),
 )
-def get_knowledge_by_id(
+async def get_knowledge_by_id(
     ids: Annotated[List[str], BeforeValidator(_ensure_list)] = Field(
         ...,
         description="A single point ID or a list of point IDs to retrieve. Use the 'id' from search-knowledge results.",
@@ -375,8 +638,9 @@ def get_knowledge_by_id(
     if not ids:
         raise ValueError("At least one ID is required to retrieve knowledge")
 
+    await _flush_pending(collection)
     # Retrieve points without vectors
-    points = _qdr.retrieve_points(collection, ids, with_vectors=False)
+    points = await _qdr().retrieve_points(collection, ids, with_vectors=False)
 
     if not points:
         return f"No knowledge items found with the provided ID(s): {', '.join(ids)}"
@@ -391,7 +655,7 @@ def get_knowledge_by_id(
             }
         )
 
-    return json.dumps(structured_results, ensure_ascii=False, indent=2)
+    return _dumps(structured_results, indent=True)
 
 
 @mcp.tool(
@@ -401,7 +665,7 @@ def get_knowledge_by_id(
         "Use the 'id' field returned from search-knowledge results."
     ),
 )
-def delete_knowledge(
+async def delete_knowledge(
     ids: Annotated[List[str], BeforeValidator(_ensure_list)] = Field(
         ...,
         description="A single point ID or a list of point IDs to delete. Use the 'id' from search-knowledge results.",
@@ -423,12 +687,34 @@ def delete_knowledge(
     if not ids:
         raise ValueError("At least one ID is required to delete memory")
 
+    await _flush_pending(collection)
     # Input is already normalized to List[str] by validator
-    _qdr.delete_points(collection, ids)
+    await _qdr().delete_points(collection, ids)
+    _search_cache.invalidate(collection)
 
     return f"Deleted {len(ids)} item(s) from collection '{collection}'"
 
 
+@mcp.tool(
+    name="flush-knowledge-writes",
+    description=(
+        "Write any buffered knowledge items to Qdrant immediately. "
+        "Only relevant when the server batches writes (SYNC_UPSERT=0)."
+    ),
+)
+async def flush_knowledge_writes() -> str:
+    """Flush buffered upserts for all collections.
+
+    Returns:
+        Confirmation message with the number of items written.
+    """
+    buffer = _upsert_buffer()
+    if buffer is None:
+        return "Writes are synchronous; nothing to flush."
+    written = await buffer.flush()
+    return f"Flushed {written} pending item(s) to Qdrant"
+
+
 def run(
     transport: str = "stdio",
     host: str = "0.0.0.0",
@@ -0,0 +1,78 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from better_qdrant_mcp import embeddings
+from better_qdrant_mcp.embedding_cache import EmbeddingCache
+from better_qdrant_mcp.embeddings import Embeddings, _micro_batches
+
+
+def _vector_for(text: str) -> list[float]:
+    # Deterministic per-text vector so results can be matched back to inputs
+    return [float(len(text)), float(sum(map(ord, text)) % 997)]
+
+
+class _FakeEmbeddingsAPI:
+    def __init__(self) -> None:
+        self.inputs: list[list[str]] = []
+
+    async def create(self, model, input, **kwargs):
+        self.inputs.append(list(input))
+        return SimpleNamespace(
+            data=[SimpleNamespace(embedding=_vector_for(t)) for t in input]
+        )
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    api = _FakeEmbeddingsAPI()
+    monkeypatch.setattr(Embeddings, "_client", SimpleNamespace(embeddings=api))
+    monkeypatch.setattr(Embeddings, "_cache", EmbeddingCache(None))
+    return api
+
+
+def test_micro_batches_cover_every_index_once(monkeypatch):
+    monkeypatch.setattr(embeddings, "_BATCH_MAX_ITEMS", 3)
+    monkeypatch.setattr(embeddings, "_BATCH_MAX_CHARS", 10)
+    texts = ["a" * n for n in (1, 9, 4, 4, 2, 7, 1)]
+
+    batches = _micro_batches(texts)
+
+    flat = [i for batch in batches for i in batch]
+    assert sorted(flat) == list(range(len(texts)))
+    for batch in batches:
+        assert len(batch) <= 3
+        # A single oversized text still gets a batch of its own
+        assert len(batch) == 1 or sum(len(texts[i]) for i in batch) <= 10
+    # Longest texts are scheduled first
+    assert flat[0] == 1
+
+
+def test_embed_many_returns_vectors_in_input_order(monkeypatch, fake_openai):
+    monkeypatch.setattr(embeddings, "_BATCH_MAX_ITEMS", 2)
+    texts = ["short", "a much longer text", "mid text", "x", "another one"]
+
+    vectors = asyncio.run(Embeddings.embed_many(texts))
+
+    assert len(fake_openai.inputs) > 1
+    assert vectors.dtype == np.float32
+    assert vectors.shape == (len(texts), 2)
+    for text, vector in zip(texts, vectors):
+        assert vector.tolist() == _vector_for(text)
+
+
+def test_embed_many_embeds_duplicates_and_cached_texts_once(fake_openai):
+    asyncio.run(Embeddings.embed_many(["cached"]))
+    fake_openai.inputs.clear()
+
+    texts = ["new", "cached", "new", "other"]
+    vectors = asyncio.run(Embeddings.embed_many(texts))
+
+    assert sorted(t for batch in fake_openai.inputs for t in batch) == [
+        "new",
+        "other",
+    ]
+    for text, vector in zip(texts, vectors):
+        assert vector.tolist() == _vector_for(text)
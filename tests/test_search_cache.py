@@ -0,0 +1,94 @@
+from better_qdrant_mcp import search_cache
+from better_qdrant_mcp.search_cache import SearchCache
+
+HITS = [{"id": "a", "score": 0.9}, {"id": "b", "score": 0.8}, {"id": "c", "score": 0.7}]
+
+
+def _cache(**kwargs) -> SearchCache:
+    kwargs.setdefault("ttl", 60)
+    return SearchCache(**kwargs)
+
+
+def test_disabled_by_default():
+    cache = SearchCache()
+    cache.put("c", "q", 5, [1.0, 0.0], HITS, cache.version("c"))
+
+    assert not cache.enabled
+    assert cache.get("c", "q", 5) is None
+    assert cache.get_similar("c", [1.0, 0.0], 5) is None
+
+
+def test_exact_hit_is_keyed_by_collection_query_and_limit():
+    cache = _cache()
+    cache.put("c", "q", 5, [1.0, 0.0], HITS, cache.version("c"))
+
+    assert cache.get("c", "q", 5) == HITS
+    assert cache.get("c", "q", 3) is None
+    assert cache.get("other", "q", 5) is None
+
+
+def test_invalidate_drops_exact_and_similar_entries():
+    cache = _cache()
+    cache.put("c", "q", 5, [1.0, 0.0], HITS, cache.version("c"))
+    cache.put("d", "q", 5, [1.0, 0.0], HITS, cache.version("d"))
+
+    cache.invalidate("c")
+
+    assert cache.get("c", "q", 5) is None
+    assert cache.get_similar("c", [1.0, 0.0], 5) is None
+    # Other collections are unaffected
+    assert cache.get("d", "q", 5) == HITS
+
+
+def test_put_ignores_results_computed_before_a_write():
+    cache = _cache()
+    version = cache.version("c")
+    # A store lands while the search is in flight
+    cache.invalidate("c")
+    cache.put("c", "q", 5, [1.0, 0.0], HITS, version)
+
+    assert cache.get("c", "q", 5) is None
+    assert cache.get_similar("c", [1.0, 0.0], 5) is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(search_cache.time, "monotonic", lambda: now[0])
+    cache = _cache(ttl=10)
+    cache.put("c", "q", 5, [1.0, 0.0], HITS, cache.version("c"))
+
+    now[0] += 11
+
+    assert cache.get("c", "q", 5) is None
+    assert cache.get_similar("c", [1.0, 0.0], 5) is None
+
+
+def test_get_similar_reuses_near_duplicate_results():
+    cache = _cache(similarity=0.95)
+    cache.put("c", "q", 3, [1.0, 0.0], HITS, cache.version("c"))
+
+    # Same direction, different magnitude: cosine 1.0
+    assert cache.get_similar("c", [2.0, 0.0], 2) == HITS[:2]
+    # Orthogonal query
+    assert cache.get_similar("c", [0.0, 1.0], 2) is None
+    # Cached results are too short for a larger limit
+    assert cache.get_similar("c", [1.0, 0.0], 5) is None
+
+
+def test_similarity_above_one_only_reuses_exact_repeats():
+    cache = _cache(similarity=1.01)
+    cache.put("c", "q", 5, [1.0, 0.0], HITS, cache.version("c"))
+
+    assert cache.get_similar("c", [1.0, 0.0], 5) is None
+    assert cache.get("c", "q", 5) == HITS
+
+
+def test_exact_entries_are_evicted_least_recently_used_first():
+    cache = _cache(max_items=2)
+    for query in ("a", "b"):
+        cache.put("c", query, 5, [1.0, 0.0], HITS, cache.version("c"))
+    cache.get("c", "a", 5)
+    cache.put("c", "new", 5, [1.0, 0.0], HITS, cache.version("c"))
+
+    assert cache.get("c", "a", 5) == HITS
+    assert cache.get("c", "b", 5) is None
@@ -0,0 +1,82 @@
+from typing import Annotated, List
+import os
+import time
+import uuid
+
+import pytest
+from pydantic import BaseModel, BeforeValidator, ValidationError
+
+from better_qdrant_mcp import tools
+from better_qdrant_mcp.embedding_cache import EmbeddingCache
+from better_qdrant_mcp.embeddings import Embeddings
+from better_qdrant_mcp.tools import _ensure_list, _new_point_id
+
+
+class _Ids(BaseModel):
+    ids: Annotated[List[str], BeforeValidator(_ensure_list)]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, []),
+        ("abc", ["abc"]),
+        (42, ["42"]),
+        (["a", 7], ["a", "7"]),
+        (("a", "b"), ["a", "b"]),
+        ({"a"}, ["a"]),
+    ],
+)
+def test_ensure_list_normalizes_ids(value, expected):
+    assert _Ids(ids=value).ids == expected
+
+
+@pytest.mark.parametrize("value", [{"a": 1}, 1.5, True])
+def test_ensure_list_leaves_invalid_ids_to_pydantic(value):
+    with pytest.raises(ValidationError):
+        _Ids(ids=value)
+
+
+@pytest.fixture(params=["stdlib", "fallback"])
+def uuid7_impl(request, monkeypatch):
+    if request.param == "fallback":
+        monkeypatch.setattr(tools, "_uuid7", None)
+    elif tools._uuid7 is None:
+        pytest.skip("uuid.uuid7 needs Python 3.14+")
+
+
+def test_new_point_id_is_rfc9562_uuid7(uuid7_impl):
+    before = time.time_ns() // 1_000_000
+    value = uuid.UUID(_new_point_id())
+    after = time.time_ns() // 1_000_000
+
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert before <= value.int >> 80 <= after
+
+
+def test_new_point_ids_are_unique_and_time_ordered(uuid7_impl):
+    first = [_new_point_id() for _ in range(100)]
+    time.sleep(0.002)
+    second = [_new_point_id() for _ in range(100)]
+
+    assert len(set(first + second)) == 200
+    # IDs from a later millisecond always sort after earlier ones
+    assert max(first) < min(second)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+# The child only inspects state and exits, so earlier tests' threads are harmless
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded")
+def test_forked_child_reopens_clients_and_cache():
+    Embeddings._cache = EmbeddingCache(None)
+    Embeddings._client = object()  # type: ignore[assignment]
+    try:
+        pid = os.fork()
+        if pid == 0:
+            reset = Embeddings._client is None and Embeddings._cache is None
+            os._exit(0 if reset and not tools._qdr.cache_info().currsize else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+    finally:
+        Embeddings.reset()
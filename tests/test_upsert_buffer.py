@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from better_qdrant_mcp import qdr_client
+from better_qdrant_mcp.qdr_client import PartialUpsertError, QdrClient, UpsertBuffer
+
+
+class _FakeClient:
+    """Records upserts; the first ``failures`` calls raise."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.written: dict[str, list] = {}
+
+    async def upsert_points(self, name, points):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("qdrant unavailable")
+        self.written.setdefault(name, []).extend(points)
+
+
+def _points(*ids):
+    return [{"id": i, "vector": [0.0], "payload": {}} for i in ids]
+
+
+def _ids(points):
+    return [p["id"] for p in points]
+
+
+def test_background_task_writes_after_window():
+    async def scenario():
+        client = _FakeClient()
+        buffer = UpsertBuffer(client, window=0.01)
+        buffer.add("c", _points("a"))
+        buffer.add("c", _points("b"))
+        await asyncio.sleep(0.1)
+        await buffer.aclose()
+        return client
+
+    client = asyncio.run(scenario())
+    assert _ids(client.written["c"]) == ["a", "b"]
+
+
+def test_failed_flush_requeues_batch_and_reports_collection():
+    forgotten = []
+
+    async def scenario():
+        client = _FakeClient(failures=1)
+        buffer = UpsertBuffer(client, window=60, on_error=forgotten.append)
+        buffer.add("c", _points("a"))
+        with pytest.raises(ConnectionError):
+            await buffer.flush("c")
+        buffer.add("c", _points("b"))
+        written = await buffer.flush("c")
+        await buffer.aclose()
+        return client, written
+
+    client, written = asyncio.run(scenario())
+    assert forgotten == ["c"]
+    assert written == 2
+    # The re-queued batch keeps its place ahead of later points
+    assert _ids(client.written["c"]) == ["a", "b"]
+
+
+def test_batch_is_dropped_after_max_retries():
+    async def scenario():
+        client = _FakeClient(failures=10)
+        buffer = UpsertBuffer(client, window=60, max_retries=2)
+        buffer.add("c", _points("a"))
+        with pytest.raises(ConnectionError):
+            await buffer.flush("c")
+        with pytest.raises(RuntimeError, match="Lost IDs: a"):
+            await buffer.flush("c")
+        client.failures = 0
+        written = await buffer.flush("c")
+        await buffer.aclose()
+        return written
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_background_failure_is_raised_by_next_check(monkeypatch):
+    monkeypatch.setattr(qdr_client, "_RETRY_DELAY", 0.01)
+
+    async def scenario():
+        client = _FakeClient(failures=10)
+        buffer = UpsertBuffer(client, window=0.01, max_retries=2)
+        buffer.add("c", _points("a"))
+        await asyncio.sleep(0.2)
+        with pytest.raises(RuntimeError, match="'c' after 2 attempts"):
+            buffer.check("c")
+        # Reported once; later calls go through
+        buffer.check("c")
+        await buffer.aclose()
+
+    asyncio.run(scenario())
+
+
+class _FlakyQdrant:
+    """AsyncQdrantClient stand-in whose ``fail_on``-th upsert call raises."""
+
+    def __init__(self, fail_on: int) -> None:
+        self.calls = 0
+        self.fail_on = fail_on
+        self.written: list = []
+
+    async def upsert(self, collection_name, points):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise ConnectionError("qdrant unavailable")
+        self.written.extend(p.id for p in points)
+
+
+def _qdr_client(fake):
+    client = QdrClient.__new__(QdrClient)
+    client._client = fake
+    return client
+
+
+def test_partial_upsert_reports_written_prefix(monkeypatch):
+    monkeypatch.setattr(qdr_client, "_UPSERT_CHUNK", 2)
+    fake = _FlakyQdrant(fail_on=2)
+    client = _qdr_client(fake)
+
+    with pytest.raises(PartialUpsertError) as info:
+        asyncio.run(client.upsert_points("c", _points(1, 2, 3, 4, 5)))
+
+    assert info.value.written == [1, 2] == fake.written
+
+
+def test_buffer_retries_only_unwritten_chunks(monkeypatch):
+    monkeypatch.setattr(qdr_client, "_UPSERT_CHUNK", 2)
+    fake = _FlakyQdrant(fail_on=2)
+
+    async def scenario():
+        buffer = UpsertBuffer(_qdr_client(fake), window=60)
+        buffer.add("c", _points(1, 2, 3, 4, 5))
+        with pytest.raises(PartialUpsertError):
+            await buffer.flush("c")
+        written = await buffer.flush("c")
+        await buffer.aclose()
+        return written
+
+    assert asyncio.run(scenario()) == 3
+    assert fake.written == [1, 2, 3, 4, 5]